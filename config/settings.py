@@ -1,11 +1,18 @@
 """
 Configuration management using Pydantic Settings
 Loads configuration from environment variables
+(.env is read once at import and merged into the environment)
 """
-from typing import List, Literal
-from pydantic import Field
+import logging
+from functools import cached_property, lru_cache
+from typing import Literal, Tuple
+from dotenv import load_dotenv
+from pydantic import Field, ValidationError, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Parse .env once for every config section; real env vars take precedence
+load_dotenv(".env", encoding="utf-8", override=False)
+
 
 class DatabaseConfig(BaseSettings):
     """Database connection configuration"""
@@ -49,16 +56,49 @@ class SyncConfig(BaseSettings):
     tables_to_sync: str = ""  # Comma-separated list
     batch_size: int = 1000
     max_retries: int = 3
-    sync_interval_seconds: int = 1
+    flush_interval_seconds: float = 0.2  # Max time events wait in a batch
+    apply_workers: int = 1  # Parallel apply threads, partitioned by primary key
+    # Parallel apply only keeps changes to the same row in order. Set this to
+    # confirm the synced tables have no foreign keys or unique keys besides
+    # the primary key; required for apply_workers > 1
+    apply_rows_independent: bool = False
     
     model_config = SettingsConfigDict(env_prefix="", extra="ignore")
     
-    @property
-    def tables_list(self) -> List[str]:
-        """Parse comma-separated tables into list"""
-        if not self.tables_to_sync:
-            return []
-        return [t.strip() for t in self.tables_to_sync.split(",") if t.strip()]
+    @field_validator("batch_size")
+    @classmethod
+    def _check_batch_size(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Batch size must be at least 1")
+        return v
+    
+    @field_validator("apply_workers")
+    @classmethod
+    def _check_apply_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Apply workers must be at least 1")
+        return v
+    
+    @model_validator(mode="after")
+    def _check_parallel_apply(self) -> "SyncConfig":
+        if self.apply_workers > 1 and not self.apply_rows_independent:
+            raise ValueError(
+                "apply_workers > 1 reorders changes to different rows; set "
+                "APPLY_ROWS_INDEPENDENT=true only if the synced tables have no "
+                "foreign keys or unique keys besides the primary key"
+            )
+        return self
+    
+    @model_validator(mode="after")
+    def _check_tables(self) -> "SyncConfig":
+        if not self.tables_list:
+            raise ValueError("No tables specified for synchronization")
+        return self
+    
+    @cached_property
+    def tables_list(self) -> Tuple[str, ...]:
+        """Parse comma-separated tables once and cache the result"""
+        return tuple(filter(None, map(str.strip, self.tables_to_sync.split(","))))
 
 
 class StorageConfig(BaseSettings):
@@ -85,60 +125,76 @@ class AppConfig(BaseSettings):
     app_name: str = "db-sync-system"
     log_level: str = "INFO"
     
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore"
-    )
+    model_config = SettingsConfigDict(env_prefix="", extra="ignore")
+    
+    @field_validator("log_level")
+    @classmethod
+    def _check_log_level(cls, v: str) -> str:
+        level = v.upper()
+        if level not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+            raise ValueError(f"Invalid log level: {v}")
+        return level
 
 
 class Settings:
     """
     Central settings manager that loads all configurations
+    
+    Each section is loaded and validated on first access, so callers
+    that only need one section do not pay for (or fail on) the others
     """
     
-    def __init__(self):
-        self.app = AppConfig()
-        self.source_db = SourceDatabaseConfig()
-        self.target_db = TargetDatabaseConfig()
-        self.sync = SyncConfig()
-        self.storage = StorageConfig()
-        self.monitoring = MonitoringConfig()
+    @cached_property
+    def app(self) -> AppConfig:
+        return AppConfig()
+    
+    @cached_property
+    def source_db(self) -> SourceDatabaseConfig:
+        return SourceDatabaseConfig()
+    
+    @cached_property
+    def target_db(self) -> TargetDatabaseConfig:
+        return TargetDatabaseConfig()
+    
+    @cached_property
+    def sync(self) -> SyncConfig:
+        return SyncConfig()
+    
+    @cached_property
+    def storage(self) -> StorageConfig:
+        return StorageConfig()
+    
+    @cached_property
+    def monitoring(self) -> MonitoringConfig:
+        return MonitoringConfig()
+    
+    def configure_logging(self) -> None:
+        """Configure root logging from AppConfig.log_level"""
+        logging.basicConfig(
+            level=self.app.log_level,
+            format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+        )
     
     def validate(self) -> bool:
         """
-        Validate configuration
+        Load every section so that configuration errors surface up front
+        Field checks live on the config classes as Pydantic validators
         
         Returns:
             bool: True if configuration is valid
         """
-        errors = []
-        
-        # Validate database types
-        valid_types = {"postgresql", "mysql"}
-        if self.source_db.type not in valid_types:
-            errors.append(f"Invalid source DB type: {self.source_db.type}")
-        if self.target_db.type not in valid_types:
-            errors.append(f"Invalid target DB type: {self.target_db.type}")
-        
-        # Validate tables to sync
-        if not self.sync.tables_list:
-            errors.append("No tables specified for synchronization")
-        
-        # Validate batch size
-        if self.sync.batch_size < 1:
-            errors.append("Batch size must be at least 1")
+        valid = True
         
-        # Validate sync interval
-        if self.sync.sync_interval_seconds < 0:
-            errors.append("Sync interval must be non-negative")
+        for section in ("app", "source_db", "target_db", "sync", "storage", "monitoring"):
+            try:
+                getattr(self, section)
+            except ValidationError as e:
+                valid = False
+                for error in e.errors():
+                    location = ".".join((section, *(str(part) for part in error["loc"])))
+                    print(f"Configuration Error: {location}: {error['msg']}")
         
-        if errors:
-            for error in errors:
-                print(f"Configuration Error: {error}")
-            return False
-        
-        return True
+        return valid
     
     def get_database_config(self, db_type: Literal["source", "target"]) -> DatabaseConfig:
         """
@@ -169,21 +225,17 @@ class Settings:
         )
 
 
-# Singleton instance
-_settings_instance = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get or create settings singleton
     
+    Use get_settings.cache_clear() to force a reload (e.g. in tests)
+    
     Returns:
         Settings: The global settings instance
     """
-    global _settings_instance
-    if _settings_instance is None:
-        _settings_instance = Settings()
-    return _settings_instance
+    return Settings()
 
 
 # Example usage
@@ -2,12 +2,17 @@
 Base connector interface for CDC operations
 All database connectors must implement this interface
 """
+import logging
+import sys
 from abc import ABC, abstractmethod
+from itertools import groupby
 from typing import Dict, Any, List, Optional, Iterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class OperationType(Enum):
     """CDC operation types"""
@@ -17,7 +22,7 @@ class OperationType(Enum):
     SNAPSHOT = "SNAPSHOT"  # Initial data load
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeEvent:
     """
     Represents a single change data capture event
@@ -29,7 +34,7 @@ class ChangeEvent:
     before: Optional[Dict[str, Any]]  # Data before change (for UPDATE/DELETE)
     after: Optional[Dict[str, Any]]   # Data after change (for INSERT/UPDATE)
     primary_key: Dict[str, Any]       # Primary key values
-    lsn: Optional[str] = None         # Log Sequence Number (PostgreSQL)
+    lsn: Optional[int] = None         # Log Sequence Number (PostgreSQL)
     gtid: Optional[str] = None        # Global Transaction ID (MySQL)
     source_db: Optional[str] = None   # Source database identifier
     
@@ -42,7 +47,7 @@ class ChangeEvent:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TableSchema:
     """
     Represents table schema information
@@ -52,13 +57,53 @@ class TableSchema:
     columns: List[Dict[str, Any]]  # [{name, type, nullable, default}, ...]
     primary_keys: List[str]
     indexes: List[Dict[str, Any]]
+    _column_types: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._column_types = {col["name"]: col["type"] for col in self.columns}
     
     def get_column_type(self, column_name: str) -> Optional[str]:
         """Get data type for a specific column"""
-        for col in self.columns:
-            if col["name"] == column_name:
-                return col["type"]
-        return None
+        return self._column_types.get(column_name)
+    
+    def get_primary_key_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract primary key values from row data, in key order"""
+        return {pk: data[pk] for pk in self.primary_keys if pk in data}
+
+
+def _insert_params(event: ChangeEvent) -> tuple:
+    return tuple(event.after.values())
+
+
+def _update_params(event: ChangeEvent) -> tuple:
+    return (*event.after.values(), *event.primary_key.values())
+
+
+def _delete_params(event: ChangeEvent) -> tuple:
+    return tuple(event.primary_key.values())
+
+
+# Statement parameters for each operation: SET/VALUES columns in
+# event.after order followed by WHERE columns in event.primary_key order.
+# Each is one walk per dict into a single tuple; column names come from
+# statement_key, so events are never split into keys and values lists.
+# Dispatch is a single dict lookup per event.
+STATEMENT_PARAMS = {
+    OperationType.INSERT: _insert_params,
+    OperationType.UPDATE: _update_params,
+    OperationType.DELETE: _delete_params,
+}
+
+
+def statement_key(event: ChangeEvent) -> tuple:
+    """
+    Key identifying the SQL statement shape for an event:
+    (operation, table, columns, pk columns)
+    
+    Events sharing a key can reuse one statement with STATEMENT_PARAMS
+    """
+    columns = tuple(event.after) if event.after else ()
+    return event.operation, event.table, columns, tuple(event.primary_key)
 
 
 class BaseConnector(ABC):
@@ -84,6 +129,18 @@ class BaseConnector(ABC):
         """
         pass
     
+    def connect_worker(self) -> "BaseConnector":
+        """
+        Open a separate connector for a thread applying changes in parallel
+        The caller disconnects it when the worker stops
+        
+        Returns:
+            BaseConnector: Connected connector with this one's configuration
+        """
+        worker = type(self)(self.config)
+        worker.connect()
+        return worker
+    
     @abstractmethod
     def disconnect(self) -> None:
         """
@@ -103,15 +160,21 @@ class BaseConnector(ABC):
         pass
     
     @abstractmethod
-    def start_streaming(self, start_lsn: Optional[str] = None) -> Iterator[ChangeEvent]:
+    def start_streaming(
+        self,
+        start_lsn: Optional[str] = None,
+        idle_timeout: Optional[float] = None
+    ) -> Iterator[Optional[ChangeEvent]]:
         """
         Start streaming change events
         
         Args:
             start_lsn: Starting position (LSN for PostgreSQL, GTID for MySQL)
+            idle_timeout: If set, yield None after this many seconds without
+                an event, so the caller can flush buffered work
             
         Yields:
-            ChangeEvent: Individual change events
+            ChangeEvent: Individual change events (or None when idle)
         """
         pass
     
@@ -141,6 +204,85 @@ class BaseConnector(ABC):
         """
         pass
     
+    def apply_changes(self, events: List[ChangeEvent]) -> int:
+        """
+        Apply a batch of change events to the database, in order
+        
+        Consecutive events sharing a statement_key are sent together by
+        _apply_group(), and the whole batch is committed as one
+        transaction. If that fails, the batch is rolled back and applied
+        again one group per transaction, stopping at the first group that
+        fails, so the events applied are always a prefix of the batch.
+        
+        Args:
+            events: Change events to apply, in commit order
+            
+        Returns:
+            int: Number of leading events applied successfully
+        """
+        try:
+            self._begin()
+            applied = sum(
+                self._apply_group(key, list(group))
+                for key, group in groupby(events, key=statement_key)
+            )
+            self._commit()
+            return applied
+        except Exception as e:
+            self._rollback()
+            logger.warning(
+                "Rolled back batch of %d changes, retrying per group: %s", len(events), e
+            )
+        
+        applied = 0
+        
+        for key, group in groupby(events, key=statement_key):
+            group = list(group)
+            try:
+                self._begin()
+                self._apply_group(key, group)
+                self._commit()
+            except Exception as e:
+                self._rollback()
+                logger.error(
+                    "Failed to apply %d %s changes on %s: %s",
+                    len(group), key[0].value, key[1], e, exc_info=True
+                )
+                break
+            applied += len(group)
+        
+        return applied
+    
+    def _apply_group(self, key: tuple, group: List[ChangeEvent]) -> int:
+        """
+        Apply events sharing a statement_key, raising on failure
+        Connectors override this to send a group in few round-trips; the
+        default applies events one at a time
+        
+        Args:
+            key: (operation, table, columns, pk columns)
+            group: Events to apply with the same statement
+            
+        Returns:
+            int: Number of events applied
+        """
+        for event in group:
+            if not self.apply_change(event):
+                raise RuntimeError(f"Failed to apply change {event}")
+        return len(group)
+    
+    def _begin(self) -> None:
+        """Start a transaction for apply_changes (no-op by default)"""
+        pass
+    
+    def _commit(self) -> None:
+        """Commit the apply_changes transaction (no-op by default)"""
+        pass
+    
+    def _rollback(self) -> None:
+        """Roll back the apply_changes transaction (no-op by default)"""
+        pass
+    
     @abstractmethod
     def execute_query(self, query: str, params: Optional[tuple] = None) -> Any:
         """
@@ -176,8 +318,32 @@ class BaseConnector(ABC):
         Returns:
             Dict with primary key column names and values
         """
-        schema = self.get_table_schema(table)
-        return {pk: data.get(pk) for pk in schema.primary_keys if pk in data}
+        return self.get_table_schema(table).get_primary_key_values(data)
+    
+    def event_position(self, event: ChangeEvent) -> Optional[str]:
+        """
+        Get the position of an event in the format start_streaming()
+        resumes from
+        
+        Args:
+            event: Change event read from this connector
+            
+        Returns:
+            str: Event position, or None if the event has none
+        """
+        position = event.lsn if event.lsn is not None else event.gtid
+        return None if position is None else str(position)
+    
+    def acknowledge(self, position: Any) -> None:
+        """
+        Confirm that changes up to a position have been applied downstream
+        Connectors that report progress to the source (e.g. replication
+        feedback) override this; the default does nothing
+        
+        Args:
+            position: LSN/GTID of the last applied change
+        """
+        pass
     
     def health_check(self) -> bool:
         """
@@ -215,7 +381,7 @@ class ConnectorFactory:
             db_type: Database type identifier (e.g., 'postgresql', 'mysql')
             connector_class: Connector class implementing BaseConnector
         """
-        cls._connectors[db_type.lower()] = connector_class
+        cls._connectors[sys.intern(db_type.lower())] = connector_class
     
     @classmethod
     def create(cls, db_type: str, config: Dict[str, Any]) -> BaseConnector:
@@ -223,7 +389,8 @@ class ConnectorFactory:
         Create a connector instance
         
         Args:
-            db_type: Database type
+            db_type: Database type (already lowercase when it comes from
+                DatabaseConfig.type; other casings are normalized)
             config: Database configuration
             
         Returns:
@@ -232,7 +399,7 @@ class ConnectorFactory:
         Raises:
             ValueError: If database type is not supported
         """
-        connector_class = cls._connectors.get(db_type.lower())
+        connector_class = cls._connectors.get(db_type) or cls._connectors.get(db_type.lower())
         if not connector_class:
             raise ValueError(
                 f"Unsupported database type: {db_type}. "
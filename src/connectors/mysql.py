@@ -2,56 +2,154 @@
 MySQL CDC Connector using binlog replication
 Reads from binary logs using mysql-replication library
 """
-import mysql.connector
-from typing import Dict, Any, List, Optional, Iterator
+import logging
+import sys
+import time
+from mysql.connector import pooling
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Iterator, Tuple
 from datetime import datetime
 
 from .base import (
     BaseConnector, ChangeEvent, TableSchema,
-    OperationType, ConnectorFactory
+    OperationType, ConnectorFactory,
+    STATEMENT_PARAMS, statement_key
 )
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=512)
+def _build_query(
+    operation: OperationType,
+    table: str,
+    columns: Tuple[str, ...],
+    pk_columns: Tuple[str, ...]
+) -> Optional[str]:
+    """
+    Build the parameterized SQL statement for a change
+    
+    Cached per (operation, table, columns, pk columns) so the string
+    is only assembled the first time a given shape is seen
+    
+    Inserts skip rows that already exist (a no-op ON DUPLICATE KEY
+    UPDATE), so events replayed after a restart apply cleanly
+    """
+    if operation == OperationType.INSERT:
+        placeholders = ", ".join(["%s"] * len(columns))
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {columns[0]} = {columns[0]}"
+        )
+    
+    where_clause = " AND ".join([f"{k} = %s" for k in pk_columns])
+    
+    if operation == OperationType.UPDATE:
+        set_clause = ", ".join([f"{k} = %s" for k in columns])
+        return f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
+    
+    if operation == OperationType.DELETE:
+        return f"DELETE FROM {table} WHERE {where_clause}"
+    
+    return None
+
 
 class MySQLConnector(BaseConnector):
     """
     MySQL CDC connector using binlog replication
     """
     
+    # Seconds a cached table schema stays valid
+    SCHEMA_CACHE_TTL = 300
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.conn = None
         self.cursor = None
+        self._pool = None
+        self._columns_cursor = None
+        self._pk_cursor = None
+        self._schema_cache: Dict[str, Tuple[float, TableSchema]] = {}
+        # Last converted binlog timestamp: (epoch seconds, datetime)
+        self._ts_cache: Tuple[Optional[int], Optional[datetime]] = (None, None)
         self.server_id = config.get("server_id", 100)
+        # Connections in the pool: this connector's own plus one for each
+        # parallel apply worker
+        self.pool_size = config.get("pool_size", 1)
     
     def connect(self) -> None:
         """Establish connection to MySQL"""
         try:
-            self.conn = mysql.connector.connect(
-                host=self.config["host"],
-                port=self.config["port"],
-                database=self.config["name"],
-                user=self.config["user"],
-                password=self.config["password"],
-                autocommit=True
-            )
-            self.cursor = self.conn.cursor(dictionary=True)
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name=f"cdc_{self.config['name']}",
+                    pool_size=self.pool_size,
+                    host=self.config["host"],
+                    port=self.config["port"],
+                    database=self.config["name"],
+                    user=self.config["user"],
+                    password=self.config["password"],
+                    autocommit=True,
+                    allow_local_infile=False
+                )
+            
+            self.conn = self.get_connection()
+            self.cursor = self.conn.cursor()
+            # A prepared cursor only keeps its last statement, so each
+            # schema query gets its own to avoid re-preparing per call
+            self._columns_cursor = self.conn.cursor(prepared=True)
+            self._pk_cursor = self.conn.cursor(prepared=True)
             self.connected = True
             
-            print(f"✓ Connected to MySQL: {self.config['host']}:{self.config['port']}")
+            logger.info("Connected to MySQL: %s:%s", self.config["host"], self.config["port"])
             
         except Exception as e:
-            print(f"✗ Failed to connect to MySQL: {e}")
+            logger.error("Failed to connect to MySQL: %s", e)
             raise
     
+    def get_connection(self):
+        """
+        Check out a connection from the pool
+        Closing the connection returns it to the pool
+        
+        Returns:
+            PooledMySQLConnection
+        """
+        if self._pool is None:
+            raise RuntimeError("MySQL connector is not connected")
+        return self._pool.get_connection()
+    
+    def connect_worker(self) -> "MySQLConnector":
+        """
+        Open a connector for a parallel apply worker on a connection
+        checked out of this connector's pool
+        
+        Returns:
+            MySQLConnector: Connected connector sharing this one's pool
+        """
+        worker = type(self)(self.config)
+        worker._pool = self._pool
+        worker.connect()
+        return worker
+    
     def disconnect(self) -> None:
-        """Close MySQL connection"""
-        if self.cursor:
-            self.cursor.close()
+        """
+        Close MySQL connection (returns it to the pool)
+        Safe to call more than once; the pool itself is kept for reconnects
+        """
+        for cursor in (self.cursor, self._columns_cursor, self._pk_cursor):
+            if cursor:
+                cursor.close()
         if self.conn:
             self.conn.close()
         
+        self.conn = None
+        self.cursor = None
+        self._columns_cursor = None
+        self._pk_cursor = None
+        
         self.connected = False
-        print("Disconnected from MySQL")
+        logger.info("Disconnected from MySQL")
     
     def setup_cdc(self, tables: List[str]) -> None:
         """
@@ -63,45 +161,64 @@ class MySQLConnector(BaseConnector):
             self.cursor.execute("SHOW VARIABLES LIKE 'log_bin'")
             result = self.cursor.fetchone()
             
-            if result and result.get("Value") == "ON":
-                print("✓ Binary logging is enabled")
+            if result and result[1] == "ON":
+                logger.info("Binary logging is enabled")
             else:
-                print("✗ Binary logging is NOT enabled")
-                print("  Please enable binlog in MySQL configuration:")
-                print("  [mysqld]")
-                print("  server-id = 1")
-                print("  log-bin = mysql-bin")
-                print("  binlog-format = ROW")
-                print("  binlog-row-image = FULL")
+                logger.error(
+                    "Binary logging is NOT enabled. "
+                    "Please enable binlog in MySQL configuration:\n"
+                    "  [mysqld]\n"
+                    "  server-id = 1\n"
+                    "  log-bin = mysql-bin\n"
+                    "  binlog-format = ROW\n"
+                    "  binlog-row-image = FULL"
+                )
                 return
             
             # Check binlog format
             self.cursor.execute("SHOW VARIABLES LIKE 'binlog_format'")
             result = self.cursor.fetchone()
             
-            if result and result.get("Value") == "ROW":
-                print("✓ Binlog format is ROW")
+            if result and result[1] == "ROW":
+                logger.info("Binlog format is ROW")
             else:
-                print(f"⚠ Binlog format is {result.get('Value')}, ROW format recommended")
+                logger.warning(
+                    "Binlog format is %s, ROW format recommended",
+                    result[1] if result else None
+                )
             
-            # Verify tables exist
-            for table in tables:
-                self.cursor.execute(f"SHOW TABLES LIKE '{table}'")
-                if not self.cursor.fetchone():
-                    print(f"⚠ Table '{table}' does not exist")
-                else:
-                    print(f"✓ Table '{table}' found")
+            # Verify tables exist in a single round-trip
+            if tables:
+                placeholders = ", ".join(["%s"] * len(tables))
+                self.cursor.execute(
+                    "SELECT TABLE_NAME FROM information_schema.TABLES "
+                    f"WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})",
+                    (self.config["name"], *tables)
+                )
+                found = {row[0] for row in self.cursor.fetchall()}
+                
+                for table in tables:
+                    if table in found:
+                        logger.info("Table '%s' found", table)
+                    else:
+                        logger.warning("Table '%s' does not exist", table)
                     
         except Exception as e:
-            print(f"✗ Failed to setup CDC: {e}")
+            logger.error("Failed to setup CDC: %s", e)
             raise
     
-    def start_streaming(self, start_position: Optional[str] = None) -> Iterator[ChangeEvent]:
+    def start_streaming(
+        self,
+        start_position: Optional[str] = None,
+        idle_timeout: Optional[float] = None
+    ) -> Iterator[Optional[ChangeEvent]]:
         """
         Start streaming change events from binlog
         
         Args:
             start_position: Starting binlog position (format: 'filename:position')
+            idle_timeout: If set, yield None after this many seconds without
+                an event (unused by this placeholder stream)
             
         Yields:
             ChangeEvent: Change events from binlog
@@ -110,9 +227,11 @@ class MySQLConnector(BaseConnector):
         mysql-replication library (pymysqlreplication) for proper binlog parsing
         """
         try:
-            print("Note: Full binlog streaming requires mysql-replication library")
-            print("Install with: pip install mysql-replication")
-            print("This is a simplified implementation for demonstration")
+            logger.warning(
+                "Full binlog streaming requires mysql-replication library "
+                "(pip install mysql-replication); "
+                "this is a simplified implementation for demonstration"
+            )
             
             # In production, you would use:
             # from pymysqlreplication import BinLogStreamReader
@@ -133,107 +252,137 @@ class MySQLConnector(BaseConnector):
             # )
             #
             # for binlogevent in stream:
-            #     for row in binlogevent.rows:
-            #         yield self._parse_binlog_event(binlogevent, row)
+            #     yield from self._parse_binlog_rows(binlogevent)
             
             # Placeholder for demo
             yield from []
             
         except Exception as e:
-            print(f"✗ Streaming error: {e}")
+            logger.error("Streaming error: %s", e)
             raise
     
-    def _parse_binlog_event(self, event, row) -> ChangeEvent:
+    def _parse_binlog_rows(self, event) -> Iterator[ChangeEvent]:
         """
-        Parse binlog event into ChangeEvent
+        Parse a binlog rows event into ChangeEvents, one per row
+        
+        Operation type, timestamp and position are resolved once per
+        binlog event and shared by all of its rows
         
         Args:
-            event: Binlog event object
-            row: Row data from event
+            event: Binlog rows event object
             
-        Returns:
+        Yields:
             ChangeEvent
         """
-        # Determine operation type
+        # Determine operation type and which row keys hold before/after images
         event_type = event.__class__.__name__
         
         if "Write" in event_type:
-            operation = OperationType.INSERT
-            after = row["values"]
-            before = None
+            operation, before_key, after_key = OperationType.INSERT, None, "values"
         elif "Update" in event_type:
-            operation = OperationType.UPDATE
-            after = row["after_values"]
-            before = row["before_values"]
+            operation, before_key, after_key = OperationType.UPDATE, "before_values", "after_values"
         elif "Delete" in event_type:
-            operation = OperationType.DELETE
-            after = None
-            before = row["values"]
+            operation, before_key, after_key = OperationType.DELETE, "values", None
         else:
-            operation = OperationType.SNAPSHOT
-            after = row.get("values")
-            before = None
+            operation, before_key, after_key = OperationType.SNAPSHOT, None, "values"
         
-        # Extract primary key
-        primary_key = self._extract_pk_from_row(event.table, before or after)
+        # Binlog events carry fresh name strings; interning lets all events
+        # for a table share one object
+        table = sys.intern(event.table)
+        schema = sys.intern(event.schema) if event.schema else event.schema
+        # Binlog timestamps have second resolution, so consecutive events
+        # usually share one and the conversion can be reused
+        ts, timestamp = self._ts_cache
+        if ts != event.timestamp:
+            timestamp = datetime.fromtimestamp(event.timestamp)
+            self._ts_cache = (event.timestamp, timestamp)
+        gtid = str(event.packet.log_pos)
         
-        return ChangeEvent(
-            operation=operation,
-            table=event.table,
-            schema=event.schema,
-            timestamp=datetime.fromtimestamp(event.timestamp),
-            before=before,
-            after=after,
-            primary_key=primary_key,
-            gtid=str(event.packet.log_pos),
-            source_db="mysql"
-        )
+        for row in event.rows:
+            before = row[before_key] if before_key else None
+            after = row.get(after_key) if after_key else None
+            
+            yield ChangeEvent(
+                operation=operation,
+                table=table,
+                schema=schema,
+                timestamp=timestamp,
+                before=before,
+                after=after,
+                primary_key=self._extract_pk_from_row(table, before or after),
+                gtid=gtid,
+                source_db="mysql"
+            )
     
     def _extract_pk_from_row(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract primary key values from row data"""
         try:
-            schema = self.get_table_schema(table)
-            return {pk: data.get(pk) for pk in schema.primary_keys if pk in data}
+            return self.get_table_schema(table).get_primary_key_values(data)
         except:
             # Fallback: assume 'id' is primary key
             return {"id": data.get("id")} if "id" in data else {}
     
     def get_table_schema(self, table_name: str) -> TableSchema:
+        """Get table schema, served from cache while it is fresh"""
+        hit = self._schema_cache.get(table_name)
+        now = time.monotonic()
+        if hit and now - hit[0] < self.SCHEMA_CACHE_TTL:
+            return hit[1]
+        
+        schema = self._fetch_table_schema(table_name)
+        self._schema_cache[table_name] = (now, schema)
+        return schema
+    
+    def invalidate_schema(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached schema after DDL
+        
+        Args:
+            table_name: Table to invalidate, or None to clear the whole cache
+        """
+        if table_name is None:
+            self._schema_cache.clear()
+        else:
+            self._schema_cache.pop(table_name, None)
+    
+    def _fetch_table_schema(self, table_name: str) -> TableSchema:
         """Get table schema from information_schema"""
+        params = (self.config["name"], table_name)
+        
         # Get columns
-        self.cursor.execute(f"""
+        self._columns_cursor.execute("""
             SELECT 
                 COLUMN_NAME, 
                 DATA_TYPE, 
                 IS_NULLABLE, 
                 COLUMN_DEFAULT
             FROM information_schema.COLUMNS
-            WHERE TABLE_SCHEMA = '{self.config["name"]}'
-            AND TABLE_NAME = '{table_name}'
+            WHERE TABLE_SCHEMA = %s
+            AND TABLE_NAME = %s
             ORDER BY ORDINAL_POSITION
-        """)
+        """, params)
         
         columns = [
             {
-                "name": row["COLUMN_NAME"],
-                "type": row["DATA_TYPE"],
-                "nullable": row["IS_NULLABLE"] == "YES",
-                "default": row["COLUMN_DEFAULT"]
+                "name": row[0],
+                "type": row[1],
+                "nullable": row[2] == "YES",
+                "default": row[3]
             }
-            for row in self.cursor.fetchall()
+            for row in self._columns_cursor.fetchall()
         ]
         
         # Get primary keys
-        self.cursor.execute(f"""
+        self._pk_cursor.execute("""
             SELECT COLUMN_NAME
             FROM information_schema.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA = '{self.config["name"]}'
-            AND TABLE_NAME = '{table_name}'
+            WHERE TABLE_SCHEMA = %s
+            AND TABLE_NAME = %s
             AND CONSTRAINT_NAME = 'PRIMARY'
             ORDER BY ORDINAL_POSITION
-        """)
+        """, params)
         
-        primary_keys = [row["COLUMN_NAME"] for row in self.cursor.fetchall()]
+        primary_keys = [row[0] for row in self._pk_cursor.fetchall()]
         
         return TableSchema(
             table_name=table_name,
@@ -246,38 +395,51 @@ class MySQLConnector(BaseConnector):
     def apply_change(self, event: ChangeEvent) -> bool:
         """Apply change event to MySQL"""
         try:
-            if event.operation == OperationType.INSERT:
-                # Build INSERT query
-                columns = list(event.after.keys())
-                values = list(event.after.values())
-                placeholders = ", ".join(["%s"] * len(values))
-                
-                query = f"INSERT INTO {event.table} ({', '.join(columns)}) VALUES ({placeholders})"
-                self.cursor.execute(query, values)
-                
-            elif event.operation == OperationType.UPDATE:
-                # Build UPDATE query
-                set_clause = ", ".join([f"{k} = %s" for k in event.after.keys()])
-                where_clause = " AND ".join([f"{k} = %s" for k in event.primary_key.keys()])
-                
-                query = f"UPDATE {event.table} SET {set_clause} WHERE {where_clause}"
-                params = list(event.after.values()) + list(event.primary_key.values())
-                
-                self.cursor.execute(query, params)
-                
-            elif event.operation == OperationType.DELETE:
-                # Build DELETE query
-                where_clause = " AND ".join([f"{k} = %s" for k in event.primary_key.keys()])
-                
-                query = f"DELETE FROM {event.table} WHERE {where_clause}"
-                self.cursor.execute(query, list(event.primary_key.values()))
+            query_params = STATEMENT_PARAMS.get(event.operation)
+            
+            # Operations without a statement (e.g. SNAPSHOT) are a no-op
+            if query_params is not None:
+                query = _build_query(*statement_key(event))
+                self.cursor.execute(query, query_params(event))
             
             return True
             
         except Exception as e:
-            print(f"✗ Failed to apply change: {e}")
+            logger.error("Failed to apply change %s: %s", event, e, exc_info=True)
             return False
     
+    def _begin(self) -> None:
+        """Start a transaction on the autocommit connection"""
+        self.conn.start_transaction()
+    
+    def _commit(self) -> None:
+        """Commit the transaction started by _begin"""
+        self.conn.commit()
+    
+    def _rollback(self) -> None:
+        """Roll back the transaction started by _begin"""
+        self.conn.rollback()
+    
+    def _apply_group(self, key: tuple, group: List[ChangeEvent]) -> int:
+        """
+        Send one group of events sharing a statement_key
+        executemany() rewrites an INSERT group into one multi-row INSERT
+        
+        Args:
+            key: (operation, table, columns, pk columns)
+            group: Events to apply with the same statement
+            
+        Returns:
+            int: Number of events applied
+        """
+        query_params = STATEMENT_PARAMS.get(key[0])
+        
+        # Nothing to apply (e.g. SNAPSHOT), same as apply_change
+        if query_params is not None:
+            self.cursor.executemany(_build_query(*key), [query_params(e) for e in group])
+        
+        return len(group)
+    
     def execute_query(self, query: str, params: Optional[tuple] = None) -> Any:
         """Execute SQL query"""
         self.cursor.execute(query, params)
@@ -289,13 +451,14 @@ class MySQLConnector(BaseConnector):
         result = self.cursor.fetchone()
         
         if result:
-            return f"{result['File']}:{result['Position']}"
+            return f"{result[0]}:{result[1]}"
         return "unknown:0"
     
     def get_binlog_info(self) -> Dict[str, Any]:
         """Get current binlog file and position"""
-        self.cursor.execute("SHOW MASTER STATUS")
-        result = self.cursor.fetchone()
+        with self.conn.cursor(dictionary=True) as cursor:
+            cursor.execute("SHOW MASTER STATUS")
+            result = cursor.fetchone()
         
         return {
             "file": result.get("File"),
@@ -2,24 +2,206 @@
 PostgreSQL CDC Connector using logical replication
 Reads from WAL using pgoutput plugin
 """
-import json
+import io
+import logging
+import queue
+import select
+import struct
+import sys
+import threading
+import time
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import LogicalReplicationConnection, ReplicationMessage
-from typing import Dict, Any, List, Optional, Iterator
+from psycopg2.extras import (
+    LogicalReplicationConnection, ReplicationMessage,
+    execute_batch, execute_values
+)
+from typing import Dict, Any, Iterable, List, Optional, Iterator, Tuple
 from datetime import datetime
+from decimal import Decimal
 
 from .base import (
     BaseConnector, ChangeEvent, TableSchema, 
-    OperationType, ConnectorFactory
+    OperationType, ConnectorFactory,
+    STATEMENT_PARAMS, statement_key
 )
 
+logger = logging.getLogger(__name__)
+
+# pgoutput message and tuple markers (protocol version 1)
+_MSG_BEGIN = ord("B")
+_MSG_RELATION = ord("R")
+_MSG_INSERT = ord("I")
+_MSG_UPDATE = ord("U")
+_MSG_DELETE = ord("D")
+_TUPLE_KEY = ord("K")
+_TUPLE_OLD = ord("O")
+_ROW_MESSAGES = frozenset((_MSG_INSERT, _MSG_UPDATE, _MSG_DELETE))
+_OLD_TUPLE_MARKERS = frozenset((_TUPLE_KEY, _TUPLE_OLD))
+_VALUE_NULL = ord("n")
+_VALUE_TEXT = ord("t")
+_VALUE_BINARY = ord("b")
+
+_INT16 = struct.Struct("!h")
+_INT32 = struct.Struct("!i")
+_UINT32 = struct.Struct("!I")
+_RELATION_COLUMN = struct.Struct("!Ii")  # type OID, type modifier
+_BEGIN = struct.Struct("!QqI")  # final LSN, commit timestamp, xid
+
+# PostgreSQL timestamps count microseconds from 2000-01-01 UTC
+_PG_EPOCH_OFFSET = 946684800
+
+# Schema queries used by get_table_schema
+_COLUMNS_SQL = """
+    SELECT column_name, data_type, is_nullable, column_default
+    FROM information_schema.columns
+    WHERE table_name = %s
+    ORDER BY ordinal_position
+"""
+
+_PK_SQL = """
+    SELECT a.attname
+    FROM pg_index i
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    WHERE i.indrelid = %s::regclass AND i.indisprimary
+"""
+
+# Text-format value converters by type OID, applied to the raw bytes of
+# the value; int() and float() parse bytes directly, so numeric columns
+# skip the str decode. Other types are decoded to str.
+_TEXT_CONVERTERS = {
+    16: lambda v: v == b"t",                       # bool
+    17: lambda v: bytes.fromhex(v[2:].decode()),   # bytea ('\\x...' hex)
+    20: int,                                       # int8
+    21: int,                                       # int2
+    23: int,                                       # int4
+    700: float,                                    # float4
+    701: float,                                    # float8
+    1700: lambda v: Decimal(v.decode()),           # numeric
+}
+_decode_text = bytes.decode
+
+
+# Marks the end of the replication stream on the event queue
+_STREAM_END = object()
+
+# source_db tag shared by every event from this connector
+_SRC_PG = sys.intern("postgresql")
+
+
+def _format_lsn(lsn: int) -> str:
+    """Format a numeric LSN as PostgreSQL's 'X/Y' text form"""
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
+
+
+def _read_string(payload: bytes, pos: int) -> Tuple[str, int]:
+    """Read a null-terminated string; returns (value, next position)"""
+    end = payload.index(b"\0", pos)
+    return payload[pos:end].decode(), end + 1
+
+
+def _read_tuple(payload: bytes, pos: int, columns: tuple) -> Tuple[Dict[str, Any], int]:
+    """
+    Read pgoutput TupleData into {column: value}; returns (row, next position)
+    Unchanged TOASTed values are not sent and are left out of the row
+    """
+    ncols, = _INT16.unpack_from(payload, pos)
+    pos += 2
+    
+    row = {}
+    for i in range(ncols):
+        kind = payload[pos]
+        pos += 1
+        
+        if kind == _VALUE_TEXT or kind == _VALUE_BINARY:
+            length, = _INT32.unpack_from(payload, pos)
+            pos += 4
+            name, convert = columns[i]
+            value = payload[pos:pos + length]
+            pos += length
+            row[name] = convert(value) if kind == _VALUE_TEXT else value
+        
+        elif kind == _VALUE_NULL:
+            row[columns[i][0]] = None
+    
+    return row, pos
+
+
+def _copy_text(value: Any) -> str:
+    """Encode a value for COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\\\x" + bytes(value).hex()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _compose_query(
+    operation: OperationType,
+    table: str,
+    columns: Tuple[str, ...],
+    pk_columns: Tuple[str, ...],
+    multi_row: bool = False
+) -> sql.Composed:
+    """
+    Compose the parameterized statement for a statement_key
+    Inserts skip rows that already exist, so events replayed after a
+    restart apply cleanly
+    """
+    if operation == OperationType.INSERT:
+        values = (
+            sql.SQL("%s") if multi_row
+            else sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(columns)))
+        )
+        return sql.SQL("INSERT INTO {} ({}) VALUES {} ON CONFLICT DO NOTHING").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            values
+        )
+    
+    where_clause = sql.SQL(" AND ").join(
+        sql.SQL("{} = {}").format(sql.Identifier(k), sql.Placeholder())
+        for k in pk_columns
+    )
+    
+    if operation == OperationType.UPDATE:
+        set_clause = sql.SQL(", ").join(
+            sql.SQL("{} = {}").format(sql.Identifier(k), sql.Placeholder())
+            for k in columns
+        )
+        return sql.SQL("UPDATE {} SET {} WHERE {}").format(
+            sql.Identifier(table), set_clause, where_clause
+        )
+    
+    return sql.SQL("DELETE FROM {} WHERE {}").format(sql.Identifier(table), where_clause)
+
 
 class PostgreSQLConnector(BaseConnector):
     """
     PostgreSQL CDC connector using logical replication
     """
     
+    # Rows fetched per round-trip by execute_query(stream=True)
+    STREAM_ITERSIZE = 10000
+    # Rows sent per COPY by bulk_insert
+    COPY_CHUNK_ROWS = 10000
+    # Max rows/statements sent per round-trip by apply_changes
+    MAX_PAGE_SIZE = 1000
+    # Max parsed events buffered between the WAL reader and the consumer
+    EVENT_QUEUE_SIZE = 10000
+    # Replication feedback is sent every FEEDBACK_EVERY messages or
+    # FEEDBACK_INTERVAL seconds, whichever comes first
+    FEEDBACK_EVERY = 500
+    FEEDBACK_INTERVAL = 1.0
+    # Seconds between status updates when the stream is idle
+    KEEPALIVE_INTERVAL = 10.0
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.conn = None
@@ -27,6 +209,22 @@ class PostgreSQLConnector(BaseConnector):
         self.cursor = None
         self.repl_cursor = None
         
+        # pgoutput relation id -> (schema, table, columns, key columns)
+        self._relations: Dict[int, tuple] = {}
+        # table -> primary key columns, filled in setup_cdc
+        self._pk_cache: Dict[str, Tuple[str, ...]] = {}
+        # (statement_key, multi_row) -> rendered SQL
+        self._stmt_cache: Dict[tuple, str] = {}
+        self._stream_count = 0
+        self._event_q: queue.Queue = queue.Queue(maxsize=self.EVENT_QUEUE_SIZE)
+        # Latest LSN acknowledged by the consumer, and the last one sent
+        self._ack_lsn = None
+        self._sent_lsn = None
+        self._msg_count = 0
+        # Commit time of the transaction being decoded (from its Begin message)
+        self._commit_ts: Optional[datetime] = None
+        self._last_feedback = 0.0
+        
         self.slot_name = config.get("slot_name", "cdc_slot")
         self.publication = config.get("publication", "cdc_publication")
     
@@ -44,24 +242,37 @@ class PostgreSQLConnector(BaseConnector):
             self.conn.autocommit = True
             self.cursor = self.conn.cursor()
             
-            # Replication connection for CDC
-            self.repl_conn = psycopg2.connect(
-                host=self.config["host"],
-                port=self.config["port"],
-                database=self.config["name"],
-                user=self.config["user"],
-                password=self.config["password"],
-                connection_factory=LogicalReplicationConnection
-            )
-            self.repl_cursor = self.repl_conn.cursor()
+            # Replication connection for CDC (not needed by apply workers)
+            if self.config.get("replication", True):
+                self.repl_conn = psycopg2.connect(
+                    host=self.config["host"],
+                    port=self.config["port"],
+                    database=self.config["name"],
+                    user=self.config["user"],
+                    password=self.config["password"],
+                    connection_factory=LogicalReplicationConnection
+                )
+                self.repl_cursor = self.repl_conn.cursor()
             
             self.connected = True
-            print(f"✓ Connected to PostgreSQL: {self.config['host']}:{self.config['port']}")
+            logger.info("Connected to PostgreSQL: %s:%s", self.config["host"], self.config["port"])
             
         except Exception as e:
-            print(f"✗ Failed to connect to PostgreSQL: {e}")
+            logger.error("Failed to connect to PostgreSQL: %s", e)
             raise
     
+    def connect_worker(self) -> "PostgreSQLConnector":
+        """
+        Open a connector for a parallel apply worker
+        Workers only apply changes, so no replication connection is opened
+        
+        Returns:
+            PostgreSQLConnector: Connected connector
+        """
+        worker = type(self)(dict(self.config, replication=False))
+        worker.connect()
+        return worker
+    
     def disconnect(self) -> None:
         """Close PostgreSQL connections"""
         if self.cursor:
@@ -74,7 +285,7 @@ class PostgreSQLConnector(BaseConnector):
             self.repl_conn.close()
         
         self.connected = False
-        print("Disconnected from PostgreSQL")
+        logger.info("Disconnected from PostgreSQL")
     
     def setup_cdc(self, tables: List[str]) -> None:
         """
@@ -94,9 +305,9 @@ class PostgreSQLConnector(BaseConnector):
                     sql.SQL("SELECT pg_create_logical_replication_slot(%s, %s)"),
                     (self.slot_name, "pgoutput")
                 )
-                print(f"✓ Created replication slot: {self.slot_name}")
+                logger.info("Created replication slot: %s", self.slot_name)
             else:
-                print(f"✓ Replication slot already exists: {self.slot_name}")
+                logger.info("Replication slot already exists: %s", self.slot_name)
             
             # Check if publication exists
             self.cursor.execute(
@@ -113,23 +324,38 @@ class PostgreSQLConnector(BaseConnector):
                         sql.SQL(tables_list)
                     )
                 )
-                print(f"✓ Created publication: {self.publication} for tables: {tables_list}")
+                logger.info("Created publication: %s for tables: %s", self.publication, tables_list)
             else:
-                print(f"✓ Publication already exists: {self.publication}")
+                logger.info("Publication already exists: %s", self.publication)
+            
+            # Cache primary keys so events are keyed by the real PK even
+            # when the replica identity is FULL or a non-PK index
+            for table in tables:
+                self._pk_cache[table] = tuple(self.get_table_schema(table).primary_keys)
                 
         except Exception as e:
-            print(f"✗ Failed to setup CDC: {e}")
+            logger.error("Failed to setup CDC: %s", e)
             raise
     
-    def start_streaming(self, start_lsn: Optional[str] = None) -> Iterator[ChangeEvent]:
+    def start_streaming(
+        self,
+        start_lsn: Optional[str] = None,
+        idle_timeout: Optional[float] = None
+    ) -> Iterator[Optional[ChangeEvent]]:
         """
         Start streaming change events from WAL
         
+        A reader thread drains the replication socket into a bounded
+        queue while the caller consumes events, so network reads overlap
+        with downstream apply. A full queue blocks the reader.
+        
         Args:
             start_lsn: Starting LSN position (format: '0/ABC123')
+            idle_timeout: If set, yield None after this many seconds without
+                an event, so the caller can flush buffered work
             
         Yields:
-            ChangeEvent: Change events from WAL
+            ChangeEvent: Change events from WAL (or None when idle)
         """
         try:
             # If no start_lsn, fetch current WAL position
@@ -139,98 +365,231 @@ class PostgreSQLConnector(BaseConnector):
 
             self.repl_cursor.start_replication(
                 slot_name=self.slot_name,
-                decode=True,
-                start_lsn=start_lsn or 0/0,
+                decode=False,
+                start_lsn=start_lsn or "0/0",
                 options={
                     "proto_version": "1",
                     "publication_names": self.publication
                 }
             )
             
-            print(f"✓ Started streaming from LSN: {start_lsn}")
-            self.repl_cursor.consume_stream(self._process_message)
+            logger.info("Started streaming from LSN: %s", start_lsn)
             
         except Exception as e:
-            print(f"✗ Streaming error: {e}")
+            logger.error("Streaming error: %s", e)
             raise
+        
+        reader = threading.Thread(target=self._read_stream, name="wal-reader", daemon=True)
+        reader.start()
+        
+        while True:
+            try:
+                item = self._event_q.get(timeout=idle_timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                logger.error("Streaming error: %s", item)
+                raise item
+            yield item
+    
+    def _read_stream(self) -> None:
+        """
+        Reader thread: read replication messages and hand events to the queue
+        
+        While the stream is idle, the socket is polled every
+        FEEDBACK_INTERVAL seconds so that acknowledgements made meanwhile
+        are still reported, and a status update goes out at least every
+        KEEPALIVE_INTERVAL seconds.
+        """
+        cursor = self.repl_cursor
+        try:
+            while not cursor.closed:
+                msg = cursor.read_message()
+                if msg is not None:
+                    self._process_message(msg)
+                    continue
+                
+                self._send_feedback(cursor, idle=True)
+                select.select([cursor], [], [], self.FEEDBACK_INTERVAL)
+        except Exception as e:
+            self._event_q.put(e)
+        else:
+            self._event_q.put(_STREAM_END)
+    
+    def event_position(self, event: ChangeEvent) -> Optional[str]:
+        """Get an event's LSN as 'X/Y', the form start_streaming() accepts"""
+        return None if event.lsn is None else _format_lsn(event.lsn)
+    
+    def acknowledge(self, position: Any) -> None:
+        """
+        Record that changes up to position are applied downstream
+        The reader thread reports it to the server as the flush LSN
+        """
+        self._ack_lsn = position
     
     def _process_message(self, msg: ReplicationMessage):
         """
-        Process individual replication message
+        Process individual replication message (runs on the reader thread)
+        
+        A message that cannot be parsed stops the stream: the error is
+        raised to _read_stream, which hands it to start_streaming, so the
+        acknowledged LSN never moves past the unparsed row.
         """
-        lsn = msg.data_start or "0/0"
-
+        lsn = msg.data_start
+        
         if msg.payload:
             try:
-                data = json.loads(msg.payload)
-                event = self._parse_wal_data(data, lsn)
-                if event:
-                    print(f"Event: {event}")
-            except json.JSONDecodeError:
-                print(f"Failed to parse message: {msg.payload}")
-
-        # Send feedback to server
-        if msg.data_start is not None:
-            msg.cursor.send_feedback(flush_lsn=msg.daata_start)
-        else:
-            print("Empty message recieved, skipping..")
+                event = self._parse_wal_data(msg.payload, lsn)
+            except (struct.error, KeyError, ValueError) as e:
+                raise ValueError(f"Failed to parse message at {_format_lsn(lsn)}: {e!r}") from e
+            
+            if event:
+                logger.debug("Event: %s", event)
+                self._event_q.put(event)
+        
+        self._msg_count += 1
+        self._send_feedback(msg.cursor)
     
-    def _parse_wal_data(self, data: Dict[str, Any], lsn: str) -> Optional[ChangeEvent]:
-        action = data.get("action")
-        
-        if action == "I":  # INSERT
-            return ChangeEvent(
-                operation=OperationType.INSERT,
-                table=data.get("table"),
-                schema=data.get("schema"),
-                timestamp=datetime.now(),
-                before=None,
-                after=data.get("columns"),
-                primary_key=self._extract_pk(data.get("columns")),
-                lsn=lsn,
-                source_db="postgresql"
-            )
+    def _send_feedback(self, cursor, idle: bool = False) -> None:
+        """
+        Report the acknowledged LSN to the server (runs on the reader thread)
         
-        elif action == "U":  # UPDATE
-            return ChangeEvent(
-                operation=OperationType.UPDATE,
-                table=data.get("table"),
-                schema=data.get("schema"),
-                timestamp=datetime.now(),
-                before=data.get("identity"),
-                after=data.get("columns"),
-                primary_key=self._extract_pk(data.get("identity")),
-                lsn=lsn,
-                source_db="postgresql"
-            )
+        Only what the consumer has acknowledged as applied is confirmed, so
+        unapplied changes are replayed after a crash. While streaming,
+        feedback is throttled to every FEEDBACK_EVERY messages or
+        FEEDBACK_INTERVAL seconds; when idle it is sent right away.
         
-        elif action == "D":  # DELETE
-            return ChangeEvent(
-                operation=OperationType.DELETE,
-                table=data.get("table"),
-                schema=data.get("schema"),
-                timestamp=datetime.now(),
-                before=data.get("identity"),
-                after=None,
-                primary_key=self._extract_pk(data.get("identity")),
-                lsn=lsn,
-                source_db="postgresql"
-            )
+        Args:
+            cursor: Replication cursor
+            idle: True when called with no message pending
+        """
+        now = time.monotonic()
+        ack_lsn = self._ack_lsn
+        
+        if ack_lsn is not None and ack_lsn != self._sent_lsn and (
+            idle
+            or self._msg_count % self.FEEDBACK_EVERY == 0
+            or now - self._last_feedback >= self.FEEDBACK_INTERVAL
+        ):
+            cursor.send_feedback(flush_lsn=ack_lsn)
+            self._sent_lsn = ack_lsn
+            self._last_feedback = now
+        elif idle and now - self._last_feedback >= self.KEEPALIVE_INTERVAL:
+            # Keepalive status update; the cursor resends its last flush LSN
+            cursor.send_feedback()
+            self._last_feedback = now
+    
+    def _parse_wal_data(self, payload: bytes, lsn: int) -> Optional[ChangeEvent]:
+        """
+        Parse a pgoutput message into a ChangeEvent
+        
+        Relation ('R') messages update the relation cache; Insert, Update
+        and Delete messages become events. Begin, Commit, Type, Origin and
+        Truncate messages yield nothing.
+        
+        Args:
+            payload: Raw pgoutput message
+            lsn: WAL position of the message
+            
+        Returns:
+            ChangeEvent or None
+        """
+        action = payload[0]
+        
+        if action == _MSG_BEGIN:
+            # Every row in the transaction shares its commit timestamp
+            _final_lsn, commit_us, _xid = _BEGIN.unpack_from(payload, 1)
+            self._commit_ts = datetime.fromtimestamp(_PG_EPOCH_OFFSET + commit_us / 1_000_000)
+            return None
+        
+        if action == _MSG_RELATION:
+            self._parse_relation(payload)
+            return None
+        
+        if action not in _ROW_MESSAGES:
+            return None
+        
+        relation_id, = _UINT32.unpack_from(payload, 1)
+        schema, table, columns, key_columns = self._relations[relation_id]
+        pos = 5
+        
+        if action == _MSG_INSERT:  # 'N' + new tuple
+            operation = OperationType.INSERT
+            before = None
+            after, pos = _read_tuple(payload, pos + 1, columns)
+            key_source = after
+        
+        elif action == _MSG_UPDATE:  # optional 'K'/'O' + old tuple, then 'N' + new tuple
+            operation = OperationType.UPDATE
+            before = None
+            if payload[pos] in _OLD_TUPLE_MARKERS:
+                identity = payload[pos]
+                before, pos = _read_tuple(payload, pos + 1, columns)
+                if identity == _TUPLE_KEY:
+                    before = {k: before[k] for k in key_columns if k in before}
+            after, pos = _read_tuple(payload, pos + 1, columns)
+            key_source = before or after
+        
+        else:  # DELETE: 'K'/'O' + old tuple
+            operation = OperationType.DELETE
+            identity = payload[pos]
+            before, pos = _read_tuple(payload, pos + 1, columns)
+            if identity == _TUPLE_KEY:
+                before = {k: before[k] for k in key_columns if k in before}
+            after = None
+            key_source = before
         
-        return None
+        return ChangeEvent(
+            operation=operation,
+            table=table,
+            schema=schema,
+            timestamp=self._commit_ts or datetime.now(),
+            before=before,
+            after=after,
+            primary_key=self._extract_pk(key_columns, key_source),
+            lsn=lsn,
+            source_db=_SRC_PG
+        )
+    
+    def _parse_relation(self, payload: bytes) -> None:
+        """Cache a Relation message: id -> (schema, table, columns, key columns)"""
+        relation_id, = _UINT32.unpack_from(payload, 1)
+        schema, pos = _read_string(payload, 5)
+        table, pos = _read_string(payload, pos)
+        # Interned so every event, statement cache key and row dict shares
+        # one string object per name
+        schema, table = sys.intern(schema), sys.intern(table)
+        pos += 1  # replica identity setting
+        ncols, = _INT16.unpack_from(payload, pos)
+        pos += 2
+        
+        columns = []
+        key_columns = []
+        for _ in range(ncols):
+            flags = payload[pos]
+            name, pos = _read_string(payload, pos + 1)
+            name = sys.intern(name)
+            type_oid, _type_modifier = _RELATION_COLUMN.unpack_from(payload, pos)
+            pos += _RELATION_COLUMN.size
+            
+            columns.append((name, _TEXT_CONVERTERS.get(type_oid, _decode_text)))
+            if flags & 1:  # part of the replica identity
+                key_columns.append(name)
+        
+        # Prefer the table's primary key; fall back to the replica identity
+        key_columns = self._pk_cache.get(table) or tuple(key_columns)
+        self._relations[relation_id] = (schema, table, tuple(columns), key_columns)
     
-    def _extract_pk(self, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    def _extract_pk(self, key_columns: Tuple[str, ...], data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         if not data:
             return {}
-        return {k: v for k, v in data.items() if k.endswith("_id") or k == "id"}
+        return {k: data[k] for k in key_columns if k in data}
     
     def get_table_schema(self, table_name: str) -> TableSchema:
-        self.cursor.execute("""
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns
-            WHERE table_name = %s
-            ORDER BY ordinal_position
-        """, (table_name,))
+        self.cursor.execute(_COLUMNS_SQL, (table_name,))
         
         columns = [
             {
@@ -242,12 +601,7 @@ class PostgreSQLConnector(BaseConnector):
             for row in self.cursor.fetchall()
         ]
         
-        self.cursor.execute("""
-            SELECT a.attname
-            FROM pg_index i
-            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
-            WHERE i.indrelid = %s::regclass AND i.indisprimary
-        """, (table_name,))
+        self.cursor.execute(_PK_SQL, (table_name,))
         
         primary_keys = [row[0] for row in self.cursor.fetchall()]
         
@@ -261,54 +615,167 @@ class PostgreSQLConnector(BaseConnector):
     
     def apply_change(self, event: ChangeEvent) -> bool:
         try:
-            if event.operation == OperationType.INSERT:
-                columns = list(event.after.keys())
-                values = list(event.after.values())
-                query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
-                    sql.Identifier(event.table),
-                    sql.SQL(", ").join(map(sql.Identifier, columns)),
-                    sql.SQL(", ").join(sql.Placeholder() * len(values))
-                )
-                self.cursor.execute(query, values)
-                
-            elif event.operation == OperationType.UPDATE:
-                set_clause = sql.SQL(", ").join(
-                    sql.SQL("{} = {}").format(sql.Identifier(k), sql.Placeholder())
-                    for k in event.after.keys()
-                )
-                where_clause = sql.SQL(" AND ").join(
-                    sql.SQL("{} = {}").format(sql.Identifier(k), sql.Placeholder())
-                    for k in event.primary_key.keys()
-                )
-                query = sql.SQL("UPDATE {} SET {} WHERE {}").format(
-                    sql.Identifier(event.table),
-                    set_clause,
-                    where_clause
-                )
-                params = list(event.after.values()) + list(event.primary_key.values())
-                self.cursor.execute(query, params)
-                
-            elif event.operation == OperationType.DELETE:
-                where_clause = sql.SQL(" AND ").join(
-                    sql.SQL("{} = {}").format(sql.Identifier(k), sql.Placeholder())
-                    for k in event.primary_key.keys()
-                )
-                query = sql.SQL("DELETE FROM {} WHERE {}").format(
-                    sql.Identifier(event.table),
-                    where_clause
-                )
-                self.cursor.execute(query, list(event.primary_key.values()))
+            query_params = STATEMENT_PARAMS.get(event.operation)
+            
+            # Operations without a statement (e.g. SNAPSHOT) are a no-op
+            if query_params is not None:
+                query = self._get_statement(statement_key(event))
+                self.cursor.execute(query, query_params(event))
             
             return True
             
         except Exception as e:
-            print(f"✗ Failed to apply change: {e}")
+            logger.error("Failed to apply change %s: %s", event, e, exc_info=True)
             return False
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> Any:
+    def _begin(self) -> None:
+        """Start a transaction on the autocommit connection"""
+        self.cursor.execute("BEGIN")
+    
+    def _commit(self) -> None:
+        """Commit the transaction started by _begin"""
+        self.cursor.execute("COMMIT")
+    
+    def _rollback(self) -> None:
+        """Roll back the transaction started by _begin"""
+        self.cursor.execute("ROLLBACK")
+    
+    def _apply_group(self, key: tuple, group: List[ChangeEvent]) -> int:
+        """
+        Send one group of events sharing a statement_key
+        Inserts go out as multi-row INSERTs via execute_values, updates
+        and deletes via execute_batch
+        
+        Args:
+            key: (operation, table, columns, pk columns)
+            group: Events to apply with the same statement
+            
+        Returns:
+            int: Number of events applied
+        """
+        operation = key[0]
+        query_params = STATEMENT_PARAMS.get(operation)
+        
+        if query_params is None:
+            # Nothing to apply (e.g. SNAPSHOT), same as apply_change
+            return len(group)
+        
+        if operation == OperationType.INSERT:
+            execute_values(
+                self.cursor,
+                self._get_statement(key, multi_row=True),
+                [query_params(e) for e in group],
+                page_size=min(len(group), self.MAX_PAGE_SIZE)
+            )
+        else:
+            # execute_batch joins up to page_size statements into one
+            # round-trip, so a group is sent without waiting per row
+            execute_batch(
+                self.cursor,
+                self._get_statement(key),
+                [query_params(e) for e in group],
+                page_size=min(len(group), self.MAX_PAGE_SIZE)
+            )
+        
+        return len(group)
+    
+    def _get_statement(self, key: tuple, multi_row: bool = False) -> str:
+        """
+        Get the rendered SQL for a statement_key, composing it only once
+        
+        Args:
+            key: (operation, table, columns, pk columns)
+            multi_row: Use the 'VALUES %s' INSERT form expected by execute_values
+            
+        Returns:
+            str: SQL ready for cursor.execute
+        """
+        cache_key = (key, multi_row)
+        query = self._stmt_cache.get(cache_key)
+        
+        if query is None:
+            query = _compose_query(*key, multi_row=multi_row).as_string(self.conn)
+            self._stmt_cache[cache_key] = query
+        
+        return query
+    
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        stream: bool = False
+    ) -> Any:
+        """
+        Execute SQL query
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+            stream: Return an iterator over a server-side cursor instead
+                of fetching every row into memory
+            
+        Returns:
+            List of rows, or an iterator of rows when stream=True
+        """
+        if stream:
+            return self._stream_query(query, params)
+        
         self.cursor.execute(query, params)
         return self.cursor.fetchall()
     
+    def _stream_query(self, query: str, params: Optional[tuple]) -> Iterator[tuple]:
+        """Yield rows from a named (server-side) cursor, STREAM_ITERSIZE at a time"""
+        self._stream_count += 1
+        # WITH HOLD lets the cursor live outside a transaction (autocommit)
+        cursor = self.conn.cursor(name=f"stream_cur_{self._stream_count}", withhold=True)
+        cursor.itersize = self.STREAM_ITERSIZE
+        
+        try:
+            cursor.execute(query, params)
+            yield from cursor
+        finally:
+            cursor.close()
+    
+    def bulk_insert(self, table: str, columns: List[str], rows: Iterable[Iterable[Any]]) -> int:
+        """
+        Insert rows with COPY FROM STDIN, COPY_CHUNK_ROWS rows per COPY
+        
+        Args:
+            table: Target table name
+            columns: Column names, in row value order
+            rows: Iterable of row value sequences (consumed lazily)
+            
+        Returns:
+            int: Number of rows copied
+        """
+        query = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, columns))
+        ).as_string(self.conn)
+        
+        copied = 0
+        buf = io.StringIO()
+        pending = 0
+        
+        for row in rows:
+            buf.write("\t".join(map(_copy_text, row)))
+            buf.write("\n")
+            pending += 1
+            
+            if pending >= self.COPY_CHUNK_ROWS:
+                buf.seek(0)
+                self.cursor.copy_expert(query, buf)
+                copied += pending
+                buf = io.StringIO()
+                pending = 0
+        
+        if pending:
+            buf.seek(0)
+            self.cursor.copy_expert(query, buf)
+            copied += pending
+        
+        return copied
+    
     def get_current_position(self) -> str:
         self.cursor.execute("SELECT pg_current_wal_lsn()")
         return self.cursor.fetchone()[0]
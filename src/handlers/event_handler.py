@@ -2,8 +2,12 @@
 Event handler for processing CDC events
 Includes conflict resolution for bidirectional sync
 """
+import logging
+import os
+import queue
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 from pathlib import Path
 import json
@@ -11,6 +15,8 @@ import json
 from src.connectors.base import ChangeEvent, OperationType, ConnectorFactory
 from config.settings import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 class ConflictResolver:
     """
@@ -53,50 +59,264 @@ class ConflictResolver:
         return None
 
 
+def _changes_primary_key(event: ChangeEvent) -> bool:
+    """True for an UPDATE whose new row has a different primary key"""
+    if event.operation != OperationType.UPDATE or not event.after:
+        return False
+    after = event.after
+    return any(k in after and after[k] != v for k, v in event.primary_key.items())
+
+
 class EventHandler:
     """
     Handles CDC events and applies them to target database
+    
+    Events are buffered in commit order and applied in batches through
+    the target's apply_changes(), once batch_size events are pending or
+    flush_interval seconds have passed since the last flush. The interval
+    is only checked as events arrive, so callers also call flush() when
+    the source goes idle (see start_streaming's idle_timeout). Targets
+    commit each batch as one transaction; on_flush, if given, is called
+    afterwards with the leading events that were applied, to acknowledge
+    them to the source.
+    
+    Events that could not be applied stay pending, ahead of newer ones,
+    and are retried on the next flush; after max_retries failed retries
+    flush() raises instead of skipping them, so delivery is at least once.
+    An acknowledged position can fall inside a source transaction, so a
+    restart may replay changes already applied; targets apply replayed
+    inserts as no-ops, and updates and deletes are idempotent.
+    
+    With workers > 1, each batch is partitioned by table and primary key
+    across worker threads, each with its own target connection. Changes
+    to the same row stay ordered on one worker, and updates that change a
+    primary key are applied between barriers; a flush waits for every
+    worker before on_flush runs. Changes to different rows may apply out
+    of order, so workers > 1 is only safe for tables without foreign keys
+    or unique keys besides the primary key (SyncConfig requires
+    apply_rows_independent to confirm this).
     """
     
-    def __init__(self, source_connector, target_connector, conflict_resolver):
+    def __init__(
+        self,
+        source_connector,
+        target_connector,
+        conflict_resolver,
+        batch_size: int = 1000,
+        flush_interval: float = 0.2,
+        on_flush: Optional[Callable[[List[ChangeEvent]], None]] = None,
+        workers: int = 1,
+        max_retries: int = 3
+    ):
         self.source = source_connector
         self.target = target_connector
         self.resolver = conflict_resolver
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.workers = workers
+        self.max_retries = max_retries
         self.processed_count = 0
         self.error_count = 0
+        self._pending: List[ChangeEvent] = []
+        self._last_flush = time.monotonic()
+        # Consecutive flushes that left events unapplied
+        self._failed_flushes = 0
+        self._stats_lock = threading.Lock()
+        self._shards: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        
+        if workers > 1:
+            self._start_workers()
+    
+    def _start_workers(self) -> None:
+        """Start one apply thread per shard, each with its own target connection"""
+        for i in range(self.workers):
+            target = self.target.connect_worker()
+            
+            shard: queue.Queue = queue.Queue()
+            thread = threading.Thread(
+                target=self._apply_worker,
+                args=(target, shard),
+                name=f"apply-{i}",
+                daemon=True
+            )
+            thread.start()
+            
+            self._shards.append(shard)
+            self._threads.append(thread)
+    
+    def _apply_worker(self, target, shard: queue.Queue) -> None:
+        """
+        Apply batches from a shard queue until a None sentinel arrives
+        Items are (events, results, index); the applied count is stored
+        in results[index]
+        """
+        while True:
+            item = shard.get()
+            try:
+                if item is None:
+                    target.disconnect()
+                    return
+                events, results, index = item
+                results[index] = self._apply(target, events)
+            finally:
+                shard.task_done()
+    
+    def _apply(self, target, batch: List[ChangeEvent]) -> int:
+        """Apply a batch on a target connection and update statistics"""
+        try:
+            applied = target.apply_changes(batch)
+        except Exception as e:
+            applied = 0
+            logger.error("Error processing batch: %s", e, exc_info=True)
+        
+        with self._stats_lock:
+            self.processed_count += applied
+            self.error_count += len(batch) - applied
+        
+        return applied
     
     def process_event(self, event: ChangeEvent) -> bool:
         """
-        Process a single change event
+        Queue a single change event for the target
         
         Args:
             event: Change event to process
             
         Returns:
-            bool: True if successful
+            bool: True once the event is accepted
         """
-        try:
-            # Check for potential conflicts
-            if event.operation == OperationType.UPDATE:
-                # Could check if target has newer version
-                pass
-            
-            # Apply change to target
-            success = self.target.apply_change(event)
-            
-            if success:
-                self.processed_count += 1
-                print(f"✓ Processed {event.operation.value} on {event.table}")
-            else:
-                self.error_count += 1
-                print(f"✗ Failed to process {event.operation.value} on {event.table}")
+        self._pending.append(event)
+        self._maybe_flush()
+        return True
+    
+    def _maybe_flush(self) -> None:
+        """Flush once batch_size events are pending or flush_interval has passed"""
+        if (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Apply all pending events to the target
+        
+        Returns:
+            int: Number of events applied successfully
             
-            return success
+        Raises:
+            RuntimeError: If events still fail after max_retries retries
+        """
+        self._last_flush = time.monotonic()
+        
+        if not self._pending:
+            return 0
+        
+        batch, self._pending = self._pending, []
+        
+        if self._shards:
+            unapplied = self._apply_sharded(batch)
+        else:
+            applied = self._apply(self.target, batch)
+            unapplied = list(range(applied, len(batch)))
+        
+        applied = len(batch) - len(unapplied)
+        # Everything before the first unapplied event is safe to acknowledge
+        done = unapplied[0] if unapplied else len(batch)
+        
+        if done and self.on_flush:
+            self.on_flush(batch[:done])
+        
+        if not unapplied:
+            logger.debug("Processed %d changes", applied)
+            self._failed_flushes = 0
+            return applied
+        
+        # Keep failed events, in order, ahead of anything queued since
+        self._pending = [batch[i] for i in unapplied] + self._pending
+        self._failed_flushes += 1
+        logger.error(
+            "Failed to process %d of %d changes (attempt %d)",
+            len(unapplied), len(batch), self._failed_flushes
+        )
+        
+        if self._failed_flushes > self.max_retries:
+            raise RuntimeError(
+                f"{len(unapplied)} changes still failing after {self.max_retries} retries"
+            )
+        
+        return applied
+    
+    def _apply_sharded(self, batch: List[ChangeEvent]) -> List[int]:
+        """
+        Apply a batch across the worker shards
+        
+        An UPDATE that changes a primary key touches rows on two shards,
+        so it is applied on its own with every shard idle before and after
+        it. Events between such updates are applied in parallel.
+        
+        Args:
+            batch: Events to apply, in commit order
             
-        except Exception as e:
-            self.error_count += 1
-            print(f"✗ Error processing event: {e}")
-            return False
+        Returns:
+            List[int]: Positions in batch of events that were not applied
+        """
+        segments = []
+        start = 0
+        for i, event in enumerate(batch):
+            if _changes_primary_key(event):
+                segments += [(start, i), (i, i + 1)]
+                start = i + 1
+        segments.append((start, len(batch)))
+        
+        for start, end in segments:
+            if start == end:
+                continue
+            unapplied = self._apply_segment(batch, start, end)
+            if unapplied:
+                # Later segments are not started, so they stay pending too
+                return unapplied + list(range(end, len(batch)))
+        
+        return []
+    
+    def _apply_segment(self, batch: List[ChangeEvent], start: int, end: int) -> List[int]:
+        """Apply batch[start:end] across the shards; returns unapplied positions"""
+        partitions: List[List[int]] = [[] for _ in self._shards]
+        for i in range(start, end):
+            event = batch[i]
+            key = hash((event.table, *event.primary_key.values()))
+            partitions[key % len(partitions)].append(i)
+        
+        results = [0] * len(self._shards)
+        for n, (shard, positions) in enumerate(zip(self._shards, partitions)):
+            if positions:
+                shard.put(([batch[i] for i in positions], results, n))
+        for shard in self._shards:
+            shard.join()
+        
+        # Each shard applies a prefix of its partition
+        unapplied = []
+        for positions, applied in zip(partitions, results):
+            unapplied.extend(positions[applied:])
+        
+        return sorted(unapplied)
+    
+    def close(self) -> None:
+        """Flush pending events and stop worker threads"""
+        try:
+            self.flush()
+        except RuntimeError as e:
+            logger.error("Closing with unapplied changes: %s", e)
+        
+        for shard in self._shards:
+            shard.put(None)
+        for thread in self._threads:
+            thread.join()
+        
+        self._shards.clear()
+        self._threads.clear()
     
     def get_stats(self) -> Dict[str, int]:
         """Get processing statistics"""
@@ -109,34 +329,77 @@ class EventHandler:
 class OffsetManager:
     """
     Manages replication offsets for crash recovery
+    
+    Offsets are kept in memory. Each save appends one line to offsets.log,
+    and offsets.json is rewritten atomically (and the log truncated) at
+    most every flush_interval seconds and on close().
     """
     
-    def __init__(self, storage_path: str):
+    def __init__(self, storage_path: str, flush_interval: float = 5.0):
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.offset_file = self.storage_path / "offsets.json"
+        self.offset_log = self.storage_path / "offsets.log"
+        self.flush_interval = flush_interval
+        
+        self._offsets = self._read_offsets()
+        self._log = open(self.offset_log, "a", encoding="utf-8")
+        self._last_flush = time.monotonic()
+    
+    def _read_offsets(self) -> Dict[str, Any]:
+        """Read offsets.json and replay any entries logged after it"""
+        offsets = {}
+        
+        if self.offset_file.exists():
+            with open(self.offset_file, "r") as f:
+                offsets = json.load(f)
+        
+        if self.offset_log.exists():
+            with open(self.offset_log, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3:  # skip a torn final line
+                        name, position, timestamp = parts
+                        offsets[name] = {"position": position, "timestamp": timestamp}
+        
+        return offsets
     
     def save_offset(self, connector_name: str, position: str) -> None:
         """Save current offset"""
-        offsets = self.load_offsets()
-        offsets[connector_name] = {
+        timestamp = datetime.now().isoformat()
+        self._offsets[connector_name] = {
             "position": position,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
         
-        with open(self.offset_file, "w") as f:
-            json.dump(offsets, f, indent=2)
+        self._log.write(f"{connector_name}\t{position}\t{timestamp}\n")
+        self._log.flush()
+        
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write offsets.json atomically and truncate the append log"""
+        tmp_file = self.offset_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(self._offsets, f, indent=2)
+        os.replace(tmp_file, self.offset_file)
+        
+        self._log.truncate(0)
+        self._last_flush = time.monotonic()
+    
+    def close(self) -> None:
+        """Flush offsets and close the append log"""
+        if not self._log.closed:
+            self.flush()
+            self._log.close()
     
     def load_offsets(self) -> Dict[str, Any]:
         """Load saved offsets"""
-        if self.offset_file.exists():
-            with open(self.offset_file, "r") as f:
-                return json.load(f)
-        return {}
+        return dict(self._offsets)
     
     def get_offset(self, connector_name: str) -> Optional[str]:
         """Get last saved offset for a connector"""
-        offsets = self.load_offsets()
-        if connector_name in offsets:
-            return offsets[connector_name]["position"]
-        return None
\ No newline at end of file
+        if connector_name in self._offsets:
+            return self._offsets[connector_name]["position"]
+        return None
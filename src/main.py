@@ -4,14 +4,12 @@ Orchestrates bidirectional database synchronization
 """
 import sys
 import signal
-from time import sleep
+import threading
 from config.settings import get_settings
 from src.connectors.base import ConnectorFactory
 from src.handlers.event_handler import ConflictResolver, EventHandler, OffsetManager
 from src.connectors import mysql
 from src.connectors import postgresql
-from dotenv import load_dotenv
-load_dotenv()
 
 def main():
     """Main application loop"""
@@ -26,6 +24,8 @@ def main():
         print("\n✗ Configuration validation failed")
         sys.exit(1)
     
+    settings.configure_logging()
+    
     print(f"\n{settings}\n")
     
     # Initialize offset manager
@@ -51,6 +51,8 @@ def main():
             "name": settings.target_db.name,
             "user": settings.target_db.user,
             "password": settings.target_db.password,
+            # One connection for the connector plus one per apply worker
+            "pool_size": settings.sync.apply_workers + 1,
         }
         
         source = ConnectorFactory.create("postgresql", source_config)
@@ -89,15 +91,36 @@ def main():
     
     # Initialize event handler
     resolver = ConflictResolver(settings.sync.conflict_resolution)
-    handler = EventHandler(source, target, resolver)
+    offset_name = f"source_{settings.source_db.type}"
+    
+    def save_offset(batch):
+        # Resume from the last applied event itself, not the source's
+        # current head, which may be ahead of events not yet applied
+        last = batch[-1]
+        source.acknowledge(last.lsn if last.lsn is not None else last.gtid)
+        position = source.event_position(last)
+        if position is not None:
+            offset_mgr.save_offset(offset_name, position)
+    
+    handler = EventHandler(
+        source,
+        target,
+        resolver,
+        batch_size=settings.sync.batch_size,
+        flush_interval=settings.sync.flush_interval_seconds,
+        on_flush=save_offset,
+        workers=settings.sync.apply_workers,
+        max_retries=settings.sync.max_retries
+    )
+    
+    # Graceful shutdown: only flag the stop here, since the signal can
+    # arrive in the middle of a flush; the loop below exits at the next
+    # event or idle tick and the finally block closes everything
+    stopping = threading.Event()
     
-    # Graceful shutdown handler
     def signal_handler(sig, frame):
         print("\n\n--- Shutting Down ---")
-        print(f"Statistics: {handler.get_stats()}")
-        source.disconnect()
-        target.disconnect()
-        sys.exit(0)
+        stopping.set()
     
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -108,33 +131,34 @@ def main():
     
     try:
         # Get last offset
-        last_offset = offset_mgr.get_offset(f"source_{settings.source_db.type}")
+        last_offset = offset_mgr.get_offset(offset_name)
         
         # Start streaming from source
         print(f"Streaming from: {last_offset or 'beginning'}")
         
-        event_stream = source.start_streaming(last_offset)
+        event_stream = source.start_streaming(
+            last_offset,
+            idle_timeout=settings.sync.flush_interval_seconds
+        )
         
         for event in event_stream:
-            # Process event
+            if stopping.is_set():
+                break
+            if event is None:
+                # Source is idle: apply what is still buffered
+                handler.flush()
+                continue
+            # Process event (offsets are saved after each applied batch)
             handler.process_event(event)
-            
-            # Save offset periodically
-            if handler.processed_count % 100 == 0:
-                current_pos = source.get_current_position()
-                offset_mgr.save_offset(
-                    f"source_{settings.source_db.type}", 
-                    current_pos
-                )
-            
-            # Rate limiting
-            sleep(settings.sync.sync_interval_seconds)
         
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
     except Exception as e:
         print(f"\n✗ Sync error: {e}")
     finally:
+        handler.close()
+        offset_mgr.close()
+        
         print("\n--- Final Statistics ---")
         print(f"  Processed: {handler.processed_count}")
         print(f"  Errors: {handler.error_count}")
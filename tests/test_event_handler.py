@@ -0,0 +1,220 @@
+"""
+Tests for batched, retried and sharded apply in EventHandler and
+BaseConnector.apply_changes, using an in-memory stub connector
+"""
+import threading
+import time
+
+import pytest
+
+from src.connectors.base import BaseConnector, ChangeEvent, OperationType
+from src.handlers.event_handler import EventHandler
+
+
+class StubConnector(BaseConnector):
+    """
+    Target that records committed event ids in config["applied"]
+    Events whose id is in config["fail"] fail to apply. Worker
+    connectors share the config, and so the same state.
+    """
+    
+    def __init__(self, config):
+        super().__init__(config)
+        self._staged = []
+        self.commits = 0
+    
+    def connect(self):
+        self.connected = True
+    
+    def disconnect(self):
+        self.connected = False
+    
+    def setup_cdc(self, tables):
+        pass
+    
+    def start_streaming(self, start_lsn=None, idle_timeout=None):
+        yield from []
+    
+    def get_table_schema(self, table_name):
+        raise NotImplementedError
+    
+    def apply_change(self, event):
+        if event.primary_key["id"] in self.config["fail"]:
+            return False
+        self._staged.append(event.primary_key["id"])
+        return True
+    
+    def execute_query(self, query, params=None):
+        return []
+    
+    def get_current_position(self):
+        return "0"
+    
+    def _begin(self):
+        self._staged = []
+    
+    def _commit(self):
+        with self.config["lock"]:
+            self.config["applied"].extend(self._staged)
+        self._staged = []
+        self.commits += 1
+    
+    def _rollback(self):
+        self._staged = []
+
+
+def stub_target(fail=()):
+    return StubConnector({"fail": set(fail), "applied": [], "lock": threading.Lock()})
+
+
+def event(id, operation=OperationType.INSERT, new_id=None, table="users"):
+    after = None if operation == OperationType.DELETE else {"id": id if new_id is None else new_id}
+    return ChangeEvent(
+        operation=operation,
+        table=table,
+        schema="public",
+        timestamp=None,
+        before=None,
+        after=after,
+        primary_key={"id": id}
+    )
+
+
+def ids(events):
+    return [e.primary_key["id"] for e in events]
+
+
+def make_handler(target, **kwargs):
+    flushed = []
+    kwargs.setdefault("flush_interval", 60)
+    handler = EventHandler(None, target, None, on_flush=lambda batch: flushed.append(ids(batch)), **kwargs)
+    return handler, flushed
+
+
+def test_apply_changes_commits_batch_once():
+    target = stub_target()
+    
+    applied = target.apply_changes([event(1), event(2), event(3, OperationType.UPDATE)])
+    
+    assert applied == 3
+    assert target.commits == 1
+    assert target.config["applied"] == [1, 2, 3]
+
+
+def test_apply_changes_falls_back_to_groups_and_stops_at_failure():
+    target = stub_target(fail={3})
+    events = [event(1), event(2), event(3, OperationType.UPDATE), event(4, OperationType.DELETE)]
+    
+    applied = target.apply_changes(events)
+    
+    # The INSERT group commits on its own; the failing UPDATE stops the batch
+    assert applied == 2
+    assert target.config["applied"] == [1, 2]
+
+
+def test_flushes_every_batch_size_events():
+    target = stub_target()
+    handler, flushed = make_handler(target, batch_size=3)
+    
+    for i in range(7):
+        handler.process_event(event(i))
+    
+    assert flushed == [[0, 1, 2], [3, 4, 5]]
+    assert ids(handler._pending) == [6]
+    
+    handler.close()
+    assert flushed[-1] == [6]
+    assert target.config["applied"] == list(range(7))
+
+
+def test_flushes_after_flush_interval():
+    target = stub_target()
+    handler, flushed = make_handler(target, batch_size=100, flush_interval=0.05)
+    
+    handler.process_event(event(1))
+    assert flushed == []
+    
+    time.sleep(0.06)
+    handler.process_event(event(2))
+    assert flushed == [[1, 2]]
+
+
+def test_failed_events_stay_pending_and_only_prefix_is_acknowledged():
+    target = stub_target(fail={3})
+    handler, flushed = make_handler(target, batch_size=6)
+    
+    for i in range(6):
+        # The failing event gets its own statement group
+        handler.process_event(event(i, OperationType.UPDATE if i == 3 else OperationType.INSERT))
+    
+    assert flushed == [[0, 1, 2]]
+    assert ids(handler._pending) == [3, 4, 5]
+    
+    target.config["fail"].clear()
+    handler.process_event(event(6))
+    handler.flush()
+    
+    assert flushed == [[0, 1, 2], [3, 4, 5, 6]]
+    assert target.config["applied"] == list(range(7))
+    assert handler.get_stats() == {"processed": 7, "errors": 3}
+
+
+def test_flush_raises_after_max_retries():
+    target = stub_target(fail={0})
+    handler, flushed = make_handler(target, batch_size=100, max_retries=1)
+    handler.process_event(event(0))
+    
+    handler.flush()
+    with pytest.raises(RuntimeError):
+        handler.flush()
+    
+    assert flushed == []
+    assert ids(handler._pending) == [0]
+
+
+def test_sharded_flush_orders_primary_key_changes():
+    target = stub_target()
+    handler, flushed = make_handler(target, batch_size=100, workers=3)
+    events = [
+        event(5),
+        event(2, OperationType.DELETE),
+        event(1, OperationType.UPDATE, new_id=2),
+        event(2, OperationType.UPDATE),
+        event(6),
+    ]
+    for e in events:
+        handler.process_event(e)
+    
+    handler.close()
+    
+    applied = target.config["applied"]
+    assert sorted(applied) == [1, 2, 2, 5, 6]
+    # The key change runs after everything before it and before everything after it
+    key_change = applied.index(1)
+    assert set(applied[:key_change]) == {5, 2}
+    assert set(applied[key_change + 1:]) == {2, 6}
+    assert flushed == [[5, 2, 1, 2, 6]]
+
+
+def test_sharded_flush_keeps_unapplied_events_in_order():
+    target = stub_target(fail={3})
+    handler, flushed = make_handler(target, batch_size=8, workers=3)
+    
+    for i in range(8):
+        # One table per event, so every event is its own statement group
+        handler.process_event(event(i, table=f"t{i}"))
+    
+    pending = ids(handler._pending)
+    applied = target.config["applied"]
+    
+    # Acknowledged up to the first failure; later events on the failing
+    # shard stay pending, in commit order, while other shards went ahead
+    assert flushed == [[0, 1, 2]]
+    assert pending[0] == 3 and pending == sorted(pending)
+    assert sorted(applied + pending) == list(range(8))
+    
+    target.config["fail"].clear()
+    handler.close()
+    
+    assert flushed[-1] == pending
+    assert sorted(target.config["applied"]) == list(range(8))
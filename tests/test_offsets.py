@@ -0,0 +1,82 @@
+"""
+Tests for resuming replication from a saved offset
+"""
+from src.connectors.postgresql import PostgreSQLConnector
+from src.handlers.event_handler import OffsetManager
+
+from test_pgoutput import insert, relation
+
+
+class FakeReplicationCursor:
+    """Replication cursor that records the start LSN and has no messages"""
+    
+    closed = True
+    
+    def __init__(self):
+        self.start_lsn = None
+    
+    def start_replication(self, **kwargs):
+        self.start_lsn = kwargs["start_lsn"]
+
+
+def _parse_lsn(lsn: str) -> int:
+    # Same parsing psycopg2 applies to a string start_lsn
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+def test_saved_offset_resumes_streaming(tmp_path):
+    lsn = (0x1 << 32) + 0x6B3748
+    connector = PostgreSQLConnector({})
+    connector._parse_wal_data(relation(), lsn - 1)
+    event = connector._parse_wal_data(insert("7", "bob", "t", "1", "1", "\\x"), lsn)
+    
+    offsets = OffsetManager(str(tmp_path))
+    offsets.save_offset("source_postgresql", connector.event_position(event))
+    offsets.close()
+    
+    offsets = OffsetManager(str(tmp_path))
+    position = offsets.get_offset("source_postgresql")
+    offsets.close()
+    assert position == "1/6B3748"
+    
+    cursor = FakeReplicationCursor()
+    connector.repl_cursor = cursor
+    assert list(connector.start_streaming(position)) == []
+    assert _parse_lsn(cursor.start_lsn) == lsn
+
+
+def test_offsets_are_replayed_from_log_after_crash(tmp_path):
+    offsets = OffsetManager(str(tmp_path), flush_interval=60)
+    offsets.save_offset("source_postgresql", "0/10")
+    offsets.save_offset("source_postgresql", "0/20")
+    offsets.save_offset("source_mysql", "bin.000001:4")
+    # No close(): offsets.json was never written
+    
+    reloaded = OffsetManager(str(tmp_path))
+    
+    assert reloaded.get_offset("source_postgresql") == "0/20"
+    assert reloaded.get_offset("source_mysql") == "bin.000001:4"
+    reloaded.close()
+
+
+def test_torn_log_line_is_ignored(tmp_path):
+    offsets = OffsetManager(str(tmp_path), flush_interval=60)
+    offsets.save_offset("source_postgresql", "0/10")
+    # Crash in the middle of writing the next entry
+    offsets._log.write("source_postgresql\t0/2")
+    offsets._log.flush()
+    
+    reloaded = OffsetManager(str(tmp_path))
+    
+    assert reloaded.get_offset("source_postgresql") == "0/10"
+    reloaded.close()
+
+
+def test_flush_compacts_log_into_json(tmp_path):
+    offsets = OffsetManager(str(tmp_path), flush_interval=60)
+    offsets.save_offset("source_postgresql", "0/10")
+    offsets.close()
+    
+    assert (tmp_path / "offsets.log").read_text() == ""
+    assert OffsetManager(str(tmp_path)).load_offsets()["source_postgresql"]["position"] == "0/10"
@@ -0,0 +1,190 @@
+"""
+Tests for the pgoutput (protocol v1) decoder in the PostgreSQL connector
+Frames are built by hand, so no database is needed
+"""
+import struct
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from src.connectors.base import OperationType
+from src.connectors.postgresql import PostgreSQLConnector, _PG_EPOCH_OFFSET
+
+RELATION_ID = 16385
+
+# (replica identity flag, name, type OID)
+USERS_COLUMNS = [
+    (1, "id", 23),        # int4, part of the key
+    (0, "name", 25),      # text
+    (0, "active", 16),    # bool
+    (0, "balance", 1700), # numeric
+    (0, "score", 701),    # float8
+    (0, "avatar", 17),    # bytea
+]
+
+
+def _string(value: str) -> bytes:
+    return value.encode() + b"\0"
+
+
+def relation(columns=USERS_COLUMNS, relation_id=RELATION_ID) -> bytes:
+    payload = b"R" + struct.pack("!I", relation_id) + _string("public") + _string("users")
+    payload += b"d" + struct.pack("!h", len(columns))
+    for flags, name, type_oid in columns:
+        payload += bytes([flags]) + _string(name) + struct.pack("!Ii", type_oid, -1)
+    return payload
+
+
+def tuple_data(*values) -> bytes:
+    """
+    Encode TupleData; values are str (text), None (null) or
+    ... (unchanged TOAST)
+    """
+    data = struct.pack("!h", len(values))
+    for value in values:
+        if value is None:
+            data += b"n"
+        elif value is ...:
+            data += b"u"
+        else:
+            raw = value.encode()
+            data += b"t" + struct.pack("!i", len(raw)) + raw
+    return data
+
+
+def insert(*values) -> bytes:
+    return b"I" + struct.pack("!I", RELATION_ID) + b"N" + tuple_data(*values)
+
+
+def update(new, old=None, marker=b"K") -> bytes:
+    payload = b"U" + struct.pack("!I", RELATION_ID)
+    if old is not None:
+        payload += marker + tuple_data(*old)
+    return payload + b"N" + tuple_data(*new)
+
+
+def delete(old, marker=b"K") -> bytes:
+    return b"D" + struct.pack("!I", RELATION_ID) + marker + tuple_data(*old)
+
+
+@pytest.fixture
+def connector():
+    conn = PostgreSQLConnector({})
+    assert conn._parse_wal_data(relation(), 1) is None
+    return conn
+
+
+def test_relation_is_cached(connector):
+    schema, table, columns, key_columns = connector._relations[RELATION_ID]
+    
+    assert (schema, table) == ("public", "users")
+    assert [name for name, _ in columns] == [c[1] for c in USERS_COLUMNS]
+    assert key_columns == ("id",)
+
+
+def test_relation_prefers_cached_primary_key():
+    conn = PostgreSQLConnector({})
+    conn._pk_cache["users"] = ("id", "name")
+    conn._parse_wal_data(relation(), 1)
+    
+    assert conn._relations[RELATION_ID][3] == ("id", "name")
+
+
+def test_relation_is_replaced_on_schema_change(connector):
+    connector._parse_wal_data(relation(USERS_COLUMNS[:2]), 2)
+    event = connector._parse_wal_data(insert("1", "bob"), 3)
+    
+    assert event.after == {"id": 1, "name": "bob"}
+
+
+def test_insert_converts_text_values(connector):
+    event = connector._parse_wal_data(insert("7", "bob", "t", "12.50", "1.5", "\\x01ff"), 42)
+    
+    assert event.operation == OperationType.INSERT
+    assert (event.schema, event.table, event.lsn) == ("public", "users", 42)
+    assert event.source_db == "postgresql"
+    assert event.before is None
+    assert event.after == {
+        "id": 7,
+        "name": "bob",
+        "active": True,
+        "balance": Decimal("12.50"),
+        "score": 1.5,
+        "avatar": b"\x01\xff",
+    }
+    assert event.primary_key == {"id": 7}
+
+
+def test_null_and_unchanged_toast_values(connector):
+    event = connector._parse_wal_data(update(["7", None, "f", ..., None, ...]), 5)
+    
+    # NULL is kept; unchanged TOAST values are not sent and are left out
+    assert event.after == {"id": 7, "name": None, "active": False, "score": None}
+    assert event.before is None
+    assert event.primary_key == {"id": 7}
+
+
+def test_update_with_key_tuple_uses_old_key(connector):
+    event = connector._parse_wal_data(
+        update(["8", "bob", "t", "1", "1", "\\x"], old=["7", None, None, None, None, None]), 6
+    )
+    
+    assert event.operation == OperationType.UPDATE
+    assert event.before == {"id": 7}
+    assert event.after["id"] == 8
+    assert event.primary_key == {"id": 7}
+
+
+def test_update_with_old_tuple_keeps_full_row(connector):
+    event = connector._parse_wal_data(
+        update(["7", "amy", "t", "1", "1", "\\x"], old=["7", "bob", "t", "1", "1", "\\x"], marker=b"O"),
+        7
+    )
+    
+    assert event.before["name"] == "bob"
+    assert event.after["name"] == "amy"
+    assert event.primary_key == {"id": 7}
+
+
+def test_delete_with_key_tuple(connector):
+    event = connector._parse_wal_data(delete(["7", None, None, None, None, None]), 8)
+    
+    assert event.operation == OperationType.DELETE
+    assert event.before == {"id": 7}
+    assert event.after is None
+    assert event.primary_key == {"id": 7}
+
+
+def test_begin_sets_commit_timestamp(connector):
+    commit = datetime(2024, 5, 1, 12, 30)
+    commit_us = int((commit.timestamp() - _PG_EPOCH_OFFSET) * 1_000_000)
+    begin = b"B" + struct.pack("!QqI", 100, commit_us, 555)
+    
+    assert connector._parse_wal_data(begin, 9) is None
+    assert connector._parse_wal_data(insert("1", "a", "t", "0", "0", "\\x"), 10).timestamp == commit
+
+
+def test_other_messages_yield_nothing(connector):
+    commit = b"C" + bytes(1) + struct.pack("!QQq", 0, 0, 0)
+    
+    assert connector._parse_wal_data(commit, 11) is None
+
+
+def test_unparsable_message_stops_stream():
+    class Cursor:
+        closed = False
+        
+        def start_replication(self, **kwargs):
+            pass
+        
+        def read_message(self):
+            # Row for a relation that was never announced
+            return SimpleNamespace(data_start=12, payload=insert("1"), cursor=self)
+    
+    conn = PostgreSQLConnector({})
+    conn.repl_cursor = Cursor()
+    
+    with pytest.raises(ValueError, match="0/C"):
+        next(conn.start_streaming("0/1"))